@@ -0,0 +1,110 @@
+"""
+Deterministic compliance classification and the Planner's task state
+machine, shared by the live agents and offline analytics (re-scoring or
+replaying days of logged responses for many users).
+
+Responses are encoded once into one-byte category codes; a whole batch is
+then mapped to status/next_action codes with bytes.translate, which walks
+the lookup table in C instead of branching per response in Python.
+"""
+import re
+from enum import IntEnum
+from typing import Iterable
+
+# Response categories (one byte per logged response).
+RESPONSE_CONFIRMED = 0
+RESPONSE_TIMEOUT = 1
+RESPONSE_OTHER = 2
+
+# Decoding tables for classify_batch output, indexed by code.
+STATUS_NAMES = ("confirmed", "missed", "pending_follow_up")
+ACTION_NAMES = ("none", "alert_caregiver")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+STATUS_PENDING_FOLLOW_UP = STATUS_CODES["pending_follow_up"]
+
+# Compiled once: a single pass over the reply instead of repeated lower()/in scans.
+# Same vocabulary as the original substring checks ("confirm" / "took").
+_CONFIRM_RE = re.compile(r"(?i)confirm|took")
+# A negated reply ("I didn't take it", "No, not yet") is never a confirmation;
+# it goes down the follow-up path instead.
+_NEGATION_RE = re.compile(r"(?i)\b(?:no|not|never)\b|n['\u2019]t\b")
+
+# bytes.translate tables (response code -> status / action code); unused codes map to 0xFF.
+_STATUS_TABLE = bytes([0, 1, 2]).ljust(256, b"\xff")
+_ACTION_TABLE = bytes([0, 1, 0]).ljust(256, b"\xff")
+
+
+def encode_response(user_response: str) -> int:
+    """Maps a raw user reply (or the TIMEOUT sentinel) to its response category."""
+    if user_response == "TIMEOUT":
+        return RESPONSE_TIMEOUT
+    if _CONFIRM_RE.search(user_response) and not _NEGATION_RE.search(user_response):
+        return RESPONSE_CONFIRMED
+    return RESPONSE_OTHER
+
+
+def encode_responses(responses: Iterable[str]) -> bytes:
+    """Encodes a log of replies into a packed array of response codes."""
+    return bytes(map(encode_response, responses))
+
+
+def classify_batch(codes: bytes) -> tuple[bytes, bytes]:
+    """
+    Applies the Health Manager's status/next_action mapping to a whole batch
+    of response codes. Returns (status_codes, action_codes), index-aligned
+    with the input.
+    """
+    return codes.translate(_STATUS_TABLE), codes.translate(_ACTION_TABLE)
+
+
+def decode_batch(status_codes: bytes, action_codes: bytes) -> list[tuple[str, str]]:
+    """Maps classify_batch output back to (a2a_status, next_action) strings."""
+    return [(STATUS_NAMES[s], ACTION_NAMES[a]) for s, a in zip(status_codes, action_codes)]
+
+
+# --- Planner task FSM ---
+
+class TaskStatus(IntEnum):
+    """Schedule task states; also the FSM's state codes."""
+    PENDING = 0
+    COMPLETED = 1
+    MISSED_ESCALATED = 2
+
+# Planner actions.
+PLAN_NOOP = 0
+PLAN_LOG_COMPLIANCE = 1
+PLAN_SEND_ALERT = 2
+
+_FSM_WIDTH = len(STATUS_NAMES)
+
+# (state, a2a_status) -> (next_state, action). A pending task resolves on its
+# first artifact; any pair not listed (resolved tasks) stays put with PLAN_NOOP.
+_FSM_RULES = {
+    (TaskStatus.PENDING, "confirmed"): (TaskStatus.COMPLETED, PLAN_LOG_COMPLIANCE),
+    (TaskStatus.PENDING, "missed"): (TaskStatus.MISSED_ESCALATED, PLAN_SEND_ALERT),
+    (TaskStatus.PENDING, "pending_follow_up"): (TaskStatus.COMPLETED, PLAN_NOOP),
+}
+
+def _build_fsm_tables() -> tuple[bytes, bytes]:
+    """Flattens _FSM_RULES into [state][input] bytes.translate tables; unused slots are 0xFF."""
+    transition = bytearray(b"\xff" * 256)
+    action = bytearray(b"\xff" * 256)
+    for state in TaskStatus:
+        for status_code, status_name in enumerate(STATUS_NAMES):
+            index = state * _FSM_WIDTH + status_code
+            transition[index], action[index] = _FSM_RULES.get((state, status_name), (state, PLAN_NOOP))
+    return bytes(transition), bytes(action)
+
+_TRANSITION, _ACTION = _build_fsm_tables()
+
+
+def step(task_state: int, status_code: int) -> tuple[int, int]:
+    """One FSM transition: returns (next_task_state, plan_action)."""
+    index = task_state * _FSM_WIDTH + status_code
+    return _TRANSITION[index], _ACTION[index]
+
+
+def step_batch(task_states: bytes, status_codes: bytes) -> tuple[bytes, bytes]:
+    """Bulk replay of step() over index-aligned state/input arrays."""
+    indices = bytes(state * _FSM_WIDTH + code for state, code in zip(task_states, status_codes))
+    return indices.translate(_TRANSITION), indices.translate(_ACTION)
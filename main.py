@@ -1,268 +1,584 @@
 import time
+import asyncio
 import json
+import re
+import functools
+import heapq
+import logging
+import queue
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from enum import IntEnum
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Literal, Protocol
+
+from classify import (
+    ACTION_NAMES, PLAN_LOG_COMPLIANCE, PLAN_NOOP, PLAN_SEND_ALERT, RESPONSE_CONFIRMED, RESPONSE_TIMEOUT,
+    STATUS_CODES, STATUS_NAMES, STATUS_PENDING_FOLLOW_UP, TaskStatus, encode_response, step,
+)
+
+# All agent output goes through this logger; see configure_logging().
+log = logging.getLogger("ecaa")
+_log_listener: QueueListener | None = None
 
 # --- 1. CORE SIMULATION COMPONENTS (LLM, TOOLS, STATE) ---
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _normalize(text: str) -> str:
+    """Canonical prompt form used as a cache key: lowercased, stripped, single-spaced."""
+    return _WHITESPACE_RE.sub(" ", text.strip()).lower()
+
+@dataclass(frozen=True, slots=True)
+class A2AArtifact:
+    """
+    Schema of the Health Manager's compliance decision. Validated once on
+    construction; frozen, so a single instance can be shared by every caller.
+    """
+    a2a_status: Literal["confirmed", "missed", "pending_follow_up"]
+    next_action: Literal["none", "alert_caregiver"]
+    response_text: str
+
+    def __post_init__(self):
+        if self.a2a_status not in STATUS_NAMES:
+            raise ValueError(f"Unknown a2a_status: {self.a2a_status!r}")
+        if self.next_action not in ACTION_NAMES:
+            raise ValueError(f"Unknown next_action: {self.next_action!r}")
+
+# Built once: json.dumps() with non-default options constructs a new encoder per call.
+_A2A_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",", ":"), default=asdict)
+_A2A_DECODER = json.JSONDecoder()
+
+def encode_a2a(artifact: dict) -> bytes:
+    """Compact UTF-8 wire form of an A2A message, for transport between agent processes."""
+    return _A2A_ENCODER.encode(artifact).encode()
+
+def decode_a2a(payload: bytes) -> dict:
+    """Inverse of encode_a2a; the embedded artifact is validated back into an A2AArtifact."""
+    message = _A2A_DECODER.decode(payload.decode())
+    message['a2a_artifact'] = A2AArtifact(**message['a2a_artifact'])
+    return message
+
+# The only two artifacts the fixed compliance outcomes can produce.
+_CONFIRMED_ARTIFACT = A2AArtifact("confirmed", "none", "Compliance confirmed. Well done!")
+_MISSED_ARTIFACT = A2AArtifact("missed", "alert_caregiver", "Dose missed. Initiating caregiver alert.")
+
 class LLMSimulator:
     """
     Mocks the behavior of the Gemini LLM for reasoning and response generation.
     In a real system, this would be an API call to Gemini-2.5-Flash.
+    Free-text compliance replies are memoized on the whitespace-normalized
+    reply so repeated reminders do not pay for another LLM round-trip;
+    conversational answers are cached by ActivityCoordinatorAgent, which
+    knows the user context they depend on.
     """
+    __slots__ = ()
+
     @staticmethod
-    def health_manager_reasoning(task: str, user_response: str) -> dict:
+    def health_manager_reasoning(task: str, user_response: str) -> A2AArtifact:
         """
         Simulates the Health Manager Agent's reasoning, which uses the LLM
         to determine compliance status and next action (A2A artifact).
-        This output models a Pydantic/JSON schema for safety.
+        The output is validated against the A2AArtifact schema for safety.
         """
-        print(f"\n[LLM-H: Reasoning on Compliance for: {task}]")
-        if "confirm" in user_response.lower() or "took" in user_response.lower():
-            # SUCCESS PATH
-            status = "confirmed"
-            next_action = "none"
-            response_text = "Compliance confirmed. Well done!"
-        elif user_response == "TIMEOUT":
+        log.info("\n[LLM-H: Reasoning on Compliance for: %s]", task)
+        response_code = encode_response(user_response)
+        # Fixed outcomes are prebuilt; artifacts are immutable, so they are shared as-is.
+        if response_code == RESPONSE_TIMEOUT:
             # ESCALATION PATH
-            status = "missed"
-            next_action = "alert_caregiver"
-            response_text = "Dose missed. Initiating caregiver alert."
-        else:
-            # INTERACTION PATH (User is confused/asks a question)
-            status = "pending_follow_up"
-            next_action = "none"
-            response_text = f"I see you asked about: '{user_response}'. Let me check the database for you."
-
-        return {
-            "a2a_status": status,
-            "next_action": next_action,
-            "response_text": response_text
-        }
+            return _MISSED_ARTIFACT
+        if response_code == RESPONSE_CONFIRMED:
+            # SUCCESS PATH
+            return _CONFIRMED_ARTIFACT
+        # INTERACTION PATH (User is confused/asks a question)
+        return LLMSimulator._cached_follow_up_reasoning(_WHITESPACE_RE.sub(" ", user_response.strip()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _cached_follow_up_reasoning(user_response: str) -> A2AArtifact:
+        """The (expensive) LLM call behind the free-text path of health_manager_reasoning."""
+        return A2AArtifact(
+            "pending_follow_up",
+            "none",
+            f"I see you asked about: '{user_response}'. Let me check the database for you."
+        )
 
     @staticmethod
     def activity_coordinator_response(query: str) -> str:
         """
         Simulates the Activity Coordinator's general conversational LLM response.
         """
-        print(f"\n[LLM-A: Generating conversational response for: {query}]")
+        log.info("\n[LLM-A: Generating conversational response for: %s]", query)
         if "breakfast" in query.lower():
             return "That's a great question! Based on your low-sodium diet and favorite foods log, I recommend a small bowl of oatmeal with berries and a glass of milk."
         return "I can help with that. Let me look up some options for you."
 
-class CustomTools:
+class Notifier(Protocol):
+    """Anything the Planner can hand a caregiver alert to."""
+    async def send(self, message: str) -> bool: ...
+
+class CaregiverNotifier:
     """
-    Mocks external services and APIs that agents call (Function Tools).
+    Mocks the SMS/Email notification service used for critical caregiver alerts.
+    One instance is injected into the Planner and reused for every alert, so a
+    real client (HTTP keep-alive session, SMS SDK) opens its connection once
+    instead of per alert. A semaphore smooths bursts such as retry storms.
     """
-    @staticmethod
-    def send_alert_to_caregiver(message: str):
+    MAX_CONCURRENT_SENDS = 16
+    __slots__ = ("_send_slots",)
+
+    def __init__(self):
+        self._send_slots = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
+
+    async def send(self, message: str) -> bool:
         """Mocks sending a critical SMS/Email alert to the caregiver."""
-        print(f"🚨 TOOL CALL: Caregiver Alert Sent!")
-        print(f"   [Notification Service]: **URGENT:** {message}")
-        print("   --- Escalation complete. Resuming Planner Loop. ---")
+        async with self._send_slots:
+            log.info("🚨 TOOL CALL: Caregiver Alert Sent!")
+            log.info("   [Notification Service]: **URGENT:** %s", message)
+            # Stands in for the notification service round-trip; yields to the event loop.
+            await asyncio.sleep(0)
+        log.info("   --- Escalation complete. Resuming Planner Loop. ---")
         return True
 
+class CustomTools:
+    """
+    Mocks external services and APIs that agents call (Function Tools).
+    """
     @staticmethod
-    def retrieve_long_term_memory(query: str) -> str:
+    def retrieve_long_term_memory(query: str, namespace: str = "") -> str:
         """
         Mocks a RAG call to a Vector Database containing health records.
+        Results are cached per namespace (the patient) and normalized query,
+        since the same med is looked up on every reminder.
         """
-        if "Blood Pressure" in query:
+        return CustomTools._cached_rag_lookup(namespace, _normalize(query))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _cached_rag_lookup(namespace: str, query: str) -> str:
+        """The (expensive) vector-DB call behind retrieve_long_term_memory; query is normalized."""
+        if "blood pressure" in query:
             return "Retrieved: Blood Pressure Med (Lisinopril 10mg) is taken daily at 8:00 AM. Key interaction: Avoid grapefruit juice."
         return "Retrieved: No critical information found for that query."
 
 # --- 2. SESSION STATE (SHARED MEMORY) ---
 
+MINUTES_PER_DAY = 24 * 60
+
+class Priority(IntEnum):
+    LOW = 0
+    HIGH = 1
+    CRITICAL = 2
+
+@dataclass(slots=True)
+class Task:
+    """A single schedule entry; slotted so per-tick field access skips dict lookups."""
+    task: str
+    status: TaskStatus
+    priority: Priority
+
+    def to_dict(self) -> dict:
+        """JSON-friendly view with enum names, for summaries and logs."""
+        return {"task": self.task, "status": self.status.name, "priority": self.priority.name}
+
 class SessionState:
     """
     Simulates the shared state across all agents (like a Redis or Firestore document).
     This is the persistent, high-context memory.
     """
-    def __init__(self):
-        self.current_time = datetime.now().replace(second=0, microsecond=0)
+    __slots__ = ("now_min", "user_profile", "daily_schedule", "tasks", "schedule_heap", "cancelled_tasks", "escalation_log")
+
+    def __init__(self, start_minute: int | None = None):
+        # Simulated clock as whole minutes since the epoch, in local time, so that
+        # now_min % MINUTES_PER_DAY is the local minute of day. Stepping it is integer math.
+        self.now_min: int = (int(time.time()) + time.localtime().tm_gmtoff) // 60
+        if start_minute is not None:
+            self.set_time_of_day(start_minute)
         self.user_profile = {"name": "Mr. David", "health_data": "Low-sodium diet, Allergic to Penicillin"}
+        # Keyed by minute of day (hour * 60 + minute).
         self.daily_schedule = {
-            "8:00": {"task": "Medication: Blood Pressure Med", "status": "PENDING", "priority": "CRITICAL"},
-            "10:30": {"task": "Activity: Walk 15 minutes", "status": "PENDING", "priority": "LOW"},
-            "15:00": {"task": "Medication: Vitamin D", "status": "PENDING", "priority": "HIGH"},
+            8 * 60: Task("Medication: Blood Pressure Med", TaskStatus.PENDING, Priority.CRITICAL),
+            10 * 60 + 30: Task("Activity: Walk 15 minutes", TaskStatus.PENDING, Priority.LOW),
+            15 * 60: Task("Medication: Vitamin D", TaskStatus.PENDING, Priority.HIGH),
         }
-        self.escalation_log = []
+        # Due-time index over the schedule: a min-heap of (minute_of_day, task_id)
+        # so the Planner only compares against the earliest pending task. Tasks
+        # already past when the session starts are not seeded; a mid-day start
+        # must not fire (and escalate) the morning's reminders all at once.
+        start = self.now_min % MINUTES_PER_DAY
+        self.tasks: dict[int, Task] = {}
+        self.schedule_heap: list[tuple[int, int]] = []
+        for task_id, (due, task_details) in enumerate(self.daily_schedule.items()):
+            self.tasks[task_id] = task_details
+            if due >= start:
+                self.schedule_heap.append((due, task_id))
+        heapq.heapify(self.schedule_heap)
+        self.cancelled_tasks: set[int] = set()
+        # Bounded ring buffer of (due epoch_minute, task_id); formatted only when read.
+        self.escalation_log: deque[tuple[int, int]] = deque(maxlen=1024)
+
+    @property
+    def current_time(self) -> datetime:
+        """Wall-clock view of now_min, for display only."""
+        return datetime(1970, 1, 1) + timedelta(minutes=self.now_min)
+
+    def set_time_of_day(self, minute_of_day: int):
+        """Moves the clock to the given minute of the current day."""
+        self.now_min += minute_of_day - self.now_min % MINUTES_PER_DAY
+
+    @staticmethod
+    def format_minute(minute_of_day: int) -> str:
+        """Display form of a minute of day, e.g. 480 -> '08:00'; used for every displayed time."""
+        return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+    def cancel_task(self, task_id: int):
+        """Drops a task from the schedule; its heap entry is skipped when it comes due."""
+        self.cancelled_tasks.add(task_id)
+
+    def iter_escalation_log(self):
+        """Yields the escalation log as display lines, e.g. '08:00 - <task> missed.'"""
+        for epoch_minute, task_id in self.escalation_log:
+            yield f"{self.format_minute(epoch_minute % MINUTES_PER_DAY)} - {self.tasks[task_id].task} missed."
+
+    def next_due(self) -> int | None:
+        """Minute of day of the earliest scheduled task, or None once the day is done."""
+        return self.schedule_heap[0][0] if self.schedule_heap else None
 
 # --- 3. AGENT DEFINITIONS ---
 
 class HealthManagerAgent:
     """Specialized agent for high-priority health and compliance tasks."""
+    __slots__ = ("llm", "state")
+
     def __init__(self, llm_simulator: LLMSimulator, session_state: SessionState):
         self.llm = llm_simulator
         self.state = session_state
 
-    def issue_reminder_and_check_compliance(self, task_time: str, task_details: dict) -> dict:
+    async def issue_reminder_and_check_compliance(self, task_minute: int, task_id: int) -> bytes:
         """
         Executes the critical sequence: reminder -> wait for compliance -> A2A decision.
-        Returns a structured A2A artifact.
+        Returns the structured A2A artifact in its wire form (see encode_a2a).
         """
-        med_info = CustomTools.retrieve_long_term_memory(task_details['task'])
-        print(f"\n>>> HEALTH MANAGER (💊) triggered at {task_time} <<<")
-        print(f"   Reminder Issued to User: Good morning, {self.state.user_profile['name']}! Time for your {task_details['task']}. {med_info}")
+        task_details = self.state.tasks[task_id]
+        med_info = CustomTools.retrieve_long_term_memory(task_details.task, namespace=self.state.user_profile['name'])
+        log.info("\n>>> HEALTH MANAGER (💊) triggered at %s <<<", SessionState.format_minute(task_minute))
+        log.info("   Reminder Issued to User: Good morning, %s! Time for your %s. %s", self.state.user_profile['name'], task_details.task, med_info)
 
         # --- SIMULATE USER INTERACTION / TIMEOUT ---
         # In a real app, this would be a UI/voice prompt awaiting a response.
-        if task_time == "8:00":
+        if task_minute == 8 * 60:
             # Simulate a timeout (Missed Dose Scenario)
-            print("\n   ... Simulating 15-minute timeout with no user confirmation ...")
+            log.info("\n   ... Simulating 15-minute timeout with no user confirmation ...")
             user_response = "TIMEOUT"
         else:
             # Simulate a successful confirmation
             user_response = "I confirm I took it. Thanks."
 
         # Use the LLM to process the result and generate the A2A artifact
-        llm_output = self.llm.health_manager_reasoning(task_details['task'], user_response)
-
-        # Update the internal state for the current day
-        if llm_output['a2a_status'] == 'missed':
-            self.state.daily_schedule[task_time]['status'] = 'MISSED - ESCALATED'
-            self.state.escalation_log.append(f"{self.state.current_time.strftime('%H:%M')} - {task_details['task']} missed.")
+        llm_output = self.llm.health_manager_reasoning(task_details.task, user_response)
 
-        print(f"   {task_details['task']} Status: {llm_output['a2a_status'].upper()}")
+        # Task status is left to the Planner's FSM (see PlannerAgent.process_a2a_artifact).
+        if log.isEnabledFor(logging.INFO):
+            log.info("   %s Status: %s", task_details.task, llm_output.a2a_status.upper())
 
         # RETURN A2A ARTIFACT (Structured Data Transfer)
-        return {
+        # Carries the integer task id; receivers resolve the name via SessionState.tasks.
+        return encode_a2a({
             "agent_source": "HealthManagerAgent",
-            "task": task_details['task'],
+            "task_id": task_id,
+            "task_minute": task_minute,
             "a2a_artifact": llm_output
-        }
+        })
 
 class ActivityCoordinatorAgent:
     """Specialized agent for general information and activity planning."""
+    RESPONSE_CACHE_TTL_MIN = 24 * 60
+    RESPONSE_CACHE_SIZE = 256
+    __slots__ = ("llm", "state", "_response_cache")
+
     def __init__(self, llm_simulator: LLMSimulator, session_state: SessionState):
         self.llm = llm_simulator
         self.state = session_state
-
-    def handle_user_query(self, query: str):
-        """Responds to general user requests using conversational LLM."""
-        print("\n>>> ACTIVITY COORDINATOR (🏡) activated <<<")
-        response = self.llm.activity_coordinator_response(query)
-        print(f"   Coordinator Response: {response}")
+        # Response cache keyed by (user, health-data hash, normalized query); the
+        # health-data hash makes old answers unreachable after a diet change.
+        # Exact match only: matching rewordings needs a real embedding model, and
+        # lexical overlap can't tell "what should I eat" from "what should I NOT eat".
+        # Values: (response, expires_at_min).
+        self._response_cache: dict[tuple[str, int, str], tuple[str, int]] = {}
+
+    async def handle_user_query(self, query: str):
+        """
+        Responds to general user requests using conversational LLM.
+        Repeats of the same question from the same user reuse the cached answer.
+        """
+        log.info("\n>>> ACTIVITY COORDINATOR (🏡) activated <<<")
+        profile = self.state.user_profile
+        cache_key = (profile['name'], hash(profile['health_data']), _normalize(query))
+        now = self.state.now_min
+        cached = self._response_cache.get(cache_key)
+        if cached is not None and cached[1] > now:
+            response = cached[0]
+        else:
+            response = self.llm.activity_coordinator_response(query)
+            cache = self._response_cache
+            cache.pop(cache_key, None)
+            if len(cache) >= self.RESPONSE_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order).
+                del cache[next(iter(cache))]
+            cache[cache_key] = (response, now + self.RESPONSE_CACHE_TTL_MIN)
+        log.info("   Coordinator Response: %s", response)
         return response
 
 class PlannerAgent:
     """The Orchestrator and Loop Agent. Manages time, state, and delegation."""
-    def __init__(self, session_state: SessionState, health_manager: HealthManagerAgent, activity_coordinator: ActivityCoordinatorAgent):
+    __slots__ = ("state", "health_manager", "activity_coordinator", "notifier", "_plans", "_background_actions")
+
+    def __init__(self, session_state: SessionState, health_manager: HealthManagerAgent, activity_coordinator: ActivityCoordinatorAgent, notifier: Notifier | None = None):
         self.state = session_state
         self.health_manager = health_manager
         self.activity_coordinator = activity_coordinator
+        self.notifier = notifier if notifier is not None else CaregiverNotifier()
+        # Plan templates indexed by the FSM's action id (see classify.step). Built
+        # once; each step takes the artifact and formats names only when it runs.
+        self._plans: dict[int, tuple[Callable[[dict], object], ...]] = {
+            PLAN_NOOP: (self._log_noop,),
+            PLAN_LOG_COMPLIANCE: (self._log_compliance,),
+            PLAN_SEND_ALERT: (self._log_escalation, self._send_alert),
+        }
+        # Tool calls running in the background (e.g. caregiver alerts).
+        self._background_actions: set[asyncio.Task] = set()
 
-    def process_a2a_artifact(self, artifact: dict):
+    def _log_escalation(self, artifact: dict):
+        log.info("   --- CRITICAL ESCALATION LOGIC ACTIVATED ---")
+        # Log the minute the task was due, not when a catch-up tick noticed it.
+        now_min = self.state.now_min
+        self.state.escalation_log.append((now_min - now_min % MINUTES_PER_DAY + artifact['task_minute'], artifact['task_id']))
+
+    def _send_alert(self, artifact: dict):
+        """Execute the critical, high-stakes tool."""
+        task = self.state.tasks[artifact['task_id']].task
+        return self.notifier.send(f"{self.state.user_profile['name']} missed their {task}.")
+
+    def _log_compliance(self, artifact: dict):
+        log.info("   Compliance for %s logged. State updated.", self.state.tasks[artifact['task_id']].task)
+
+    def _log_noop(self, artifact: dict):
+        log.info("   A2A handled. No further immediate action required.")
+
+    async def process_a2a_artifact(self, artifact: dict) -> TaskStatus:
         """
         Crucial step: The Planner Agent reads the structured A2A output
         and executes deterministic logic based on the status.
+        The task FSM is the only writer of task status: from the task's
+        current status it picks the action and the next status, which is
+        stored on the task and returned. A task that is already resolved
+        stays put, so re-processing its artifact repeats no action.
+        Tool calls are scheduled in the background.
         """
-        a2a_data = artifact.get('a2a_artifact', {})
-        status = a2a_data.get('a2a_status')
-        next_action = a2a_data.get('next_action')
-
-        print(f"\n[PLANNER (🧠): Processing A2A Artifact from {artifact['agent_source']}]")
-        print(f"   Status: {status.upper()} | Next Action: {next_action.upper()}")
-
-        if status == "missed" and next_action == "alert_caregiver":
-            # Execute the critical, high-stakes tool
-            print("   --- CRITICAL ESCALATION LOGIC ACTIVATED ---")
-            CustomTools.send_alert_to_caregiver(
-                f"{self.state.user_profile['name']} missed their {artifact['task']}."
-            )
-        elif status == "confirmed":
-            print(f"   Compliance for {artifact['task']} logged. State updated.")
-        else:
-            print("   A2A handled. No further immediate action required.")
-
-    def run_step(self):
+        a2a_data = artifact['a2a_artifact']
+        status = a2a_data.a2a_status
+        next_action = a2a_data.next_action
+
+        log.info("\n[PLANNER (🧠): Processing A2A Artifact from %s]", artifact['agent_source'])
+        if log.isEnabledFor(logging.INFO):
+            log.info("   Status: %s | Next Action: %s", status.upper(), next_action.upper())
+
+        task_details = self.state.tasks[artifact['task_id']]
+        next_status, plan_action = step(task_details.status, STATUS_CODES.get(status, STATUS_PENDING_FOLLOW_UP))
+        for action in self._plans[plan_action]:
+            result = action(artifact)
+            if asyncio.iscoroutine(result):
+                # Don't block the loop on tool I/O; the next agent call can overlap it.
+                task = asyncio.create_task(result)
+                self._background_actions.add(task)
+                task.add_done_callback(self._background_actions.discard)
+        next_status = TaskStatus(next_status)
+        task_details.status = next_status
+        return next_status
+
+    async def wait_for_background_actions(self):
+        """Awaits the tool calls that process_a2a_artifact dispatched in the background."""
+        if self._background_actions:
+            await asyncio.gather(*self._background_actions)
+
+    async def run_step(self):
         """
         Simulates one step of the Loop: checks the time and triggers
         the appropriate agent or logic.
         """
-        current_time_str = self.state.current_time.strftime("%H:%M")
-        print(f"\n--- PLANNER LOOP STEP: {current_time_str} ---")
+        now = self.state.now_min % MINUTES_PER_DAY
+        log.info("\n--- PLANNER LOOP STEP: %s ---", SessionState.format_minute(now))
 
         # 1. CHECK SCHEDULE (The Loop Functionality)
-        if current_time_str in self.state.daily_schedule:
-            task_details = self.state.daily_schedule[current_time_str]
-            if task_details['status'] == 'PENDING':
-                print(f"   Scheduled Task Found: {task_details['task']}")
+        state = self.state
+        heap = state.schedule_heap
+        if not heap or heap[0][0] > now:
+            log.info("   No scheduled task at this time. Monitoring ambient environment.")
+            return
+
+        tasks = state.tasks
+        cancelled_tasks = state.cancelled_tasks
+        while heap and heap[0][0] <= now:
+            task_minute, task_id = heapq.heappop(heap)
+            if task_id in cancelled_tasks:
+                continue
+            task_details = tasks[task_id]
+            if task_details.status == TaskStatus.PENDING:
+                log.info("   Scheduled Task Found: %s", task_details.task)
 
                 # 2. DELEGATION (Sequential Workflow)
-                if task_details['priority'] in ['CRITICAL', 'HIGH']:
-                    print("   Delegating to Health Manager (High Priority).")
-                    a2a_artifact = self.health_manager.issue_reminder_and_check_compliance(current_time_str, task_details)
+                if task_details.priority >= Priority.HIGH:
+                    log.info("   Delegating to Health Manager (High Priority).")
+                    payload = await self.health_manager.issue_reminder_and_check_compliance(task_minute, task_id)
+                    # Decoding re-validates the artifact, as it would across a process boundary.
+                    a2a_artifact = decode_a2a(payload)
 
                     # 3. A2A PROTOCOL & ESCALATION
-                    self.process_a2a_artifact(a2a_artifact)
-
-                    # Update internal state status to prevent repeated action
-                    self.state.daily_schedule[current_time_str]['status'] = 'COMPLETED'
+                    # The new status also prevents repeated action.
+                    await self.process_a2a_artifact(a2a_artifact)
                 else:
-                    print("   Delegating to Activity Coordinator (Low Priority).")
+                    log.info("   Delegating to Activity Coordinator (Low Priority).")
                     # For low-priority tasks, simply mark as completed for the simulation
-                    self.state.daily_schedule[current_time_str]['status'] = 'COMPLETED'
-                    print(f"   {task_details['task']} marked as done.")
+                    task_details.status = TaskStatus.COMPLETED
+                    log.info("   %s marked as done.", task_details.task)
 
-        else:
-            print("   No scheduled task at this time. Monitoring ambient environment.")
+class FacilityPlanner:
+    """
+    Drives the Planner loops of many residents on one facility clock.
+    Residents are indexed by their next due minute, so a tick only touches
+    residents with a task due; when nobody is due the tick is one comparison.
+    """
+    __slots__ = ("planners", "_next_due")
+
+    def __init__(self, planners: list[PlannerAgent]):
+        self.planners = planners
+        # Min-heap of (next_due_minute, resident_index).
+        self._next_due: list[tuple[int, int]] = [
+            (due, index) for index, planner in enumerate(planners)
+            if (due := planner.state.next_due()) is not None
+        ]
+        heapq.heapify(self._next_due)
+
+    async def run_step(self, now_min: int):
+        """
+        One facility tick at epoch minute now_min: runs run_step only for
+        residents whose next task is due. Returns once the background tool
+        calls (caregiver alerts) those steps dispatched have completed, so a
+        tick never leaves an alert to be cancelled when the event loop closes.
+        """
+        now_minute = now_min % MINUTES_PER_DAY
+        heap = self._next_due
+        due_residents = []
+        while heap and heap[0][0] <= now_minute:
+            due_residents.append(heapq.heappop(heap)[1])
+
+        for index in due_residents:
+            planner = self.planners[index]
+            planner.state.now_min = now_min
+            await planner.run_step()
+            due = planner.state.next_due()
+            if due is not None:
+                heapq.heappush(heap, (due, index))
+        # Alerts overlap the remaining residents' steps, but finish within the tick.
+        if due_residents:
+            await asyncio.gather(*(self.planners[index].wait_for_background_actions() for index in due_residents))
 
 
 # --- 4. EXECUTION SIMULATION ---
 
-def run_eca_crew_simulation():
+def configure_logging(log_path: str | None = None, level: int = logging.INFO):
+    """
+    Routes the "ecaa" logger through a queue so agents never block on console
+    or file I/O; a background listener thread does the writing. Output goes to
+    stdout unless log_path is given. Use level=logging.WARNING for benchmark
+    runs to skip the hot-path logging entirely. Calling it again replaces the
+    previous setup; call stop_logging() to flush before exit.
+    """
+    global _log_listener
+    stop_logging()
+    handler = logging.FileHandler(log_path, encoding="utf-8") if log_path else logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    log.addHandler(QueueHandler(log_queue))
+    log.setLevel(level)
+    log.propagate = False
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+
+def stop_logging():
+    """Flushes and stops the listener started by configure_logging(), if any."""
+    global _log_listener
+    for existing in list(log.handlers):
+        if isinstance(existing, QueueHandler):
+            log.removeHandler(existing)
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+async def run_eca_crew_simulation():
     """
     Main function to initialize and run the simulation, demonstrating the
     high-priority escalation scenario.
     """
-    print("=======================================================================")
-    print("       ELDERLY CARE & ACTIVITY ASSISTANT (ECAA) CREW SIMULATION        ")
-    print("=======================================================================")
+    log.info("=======================================================================")
+    log.info("       ELDERLY CARE & ACTIVITY ASSISTANT (ECAA) CREW SIMULATION        ")
+    log.info("=======================================================================")
 
     # Setup the Environment and Agents
-    state = SessionState()
+    # Start the day at 8:00 so the CRITICAL event is the first task due
+    state = SessionState(start_minute=8 * 60)
     llm = LLMSimulator()
     health_manager = HealthManagerAgent(llm, state)
     activity_coordinator = ActivityCoordinatorAgent(llm, state)
-    planner = PlannerAgent(state, health_manager, activity_coordinator)
-
-    # Set initial time for the simulation to trigger the CRITICAL event
-    state.current_time = state.current_time.replace(hour=8, minute=0, second=0)
+    planner = PlannerAgent(state, health_manager, activity_coordinator, CaregiverNotifier())
 
-    print(f"Simulation Start Time: {state.current_time.strftime('%Y-%m-%d %H:%M')}")
-    print(f"Target User: {state.user_profile['name']}\n")
+    log.info("Simulation Start Time: %s", state.current_time.strftime('%Y-%m-%d %H:%M'))
+    log.info("Target User: %s\n", state.user_profile['name'])
 
     # --- SIMULATION STEP 1: CRITICAL REMINDER & TIMEOUT ---
-    print("\n\n--- SIMULATING TIME: 8:00 AM (CRITICAL MEDICATION TIME) ---")
-    planner.run_step()
+    log.info("\n\n--- SIMULATING TIME: 8:00 AM (CRITICAL MEDICATION TIME) ---")
+    await planner.run_step()
 
     # The Planner receives the A2A artifact which flags "missed" and triggers the alert tool.
-    print("\n[Simulation Point: Critical Escalation Executed and Logged]")
-    print(f"Escalation Log: {state.escalation_log}")
+    log.info("\n[Simulation Point: Critical Escalation Executed and Logged]")
+    log.info("Escalation Log: %s", list(state.iter_escalation_log()))
 
     # --- SIMULATION STEP 2: USER CONVERSATION DURING ESCALATION ---
-    state.current_time += timedelta(minutes=1) # Advance time slightly
+    state.now_min += 1 # Advance time slightly
     user_query = "What should I eat for breakfast?"
-    print(f"\n\n--- SIMULATING USER INTERACTION AT 8:01 AM ---")
-    print(f"User Query: '{user_query}'")
+    log.info("\n\n--- SIMULATING USER INTERACTION AT 8:01 AM ---")
+    log.info("User Query: '%s'", user_query)
 
-    # The Activity Coordinator can run in parallel while the background action (alert) finishes.
-    coordinator_response = activity_coordinator.handle_user_query(user_query)
+    # The Activity Coordinator runs in parallel while the background action (alert) finishes.
+    coordinator_response, _ = await asyncio.gather(
+        activity_coordinator.handle_user_query(user_query),
+        planner.wait_for_background_actions(),
+    )
 
 
     # --- SIMULATION STEP 3: LATER, SUCCESSFUL TASK ---
-    state.current_time = state.current_time.replace(hour=15, minute=0, second=0)
-    print("\n\n--- SIMULATING TIME: 3:00 PM (SUCCESSFUL MEDICATION TASK) ---")
-    planner.run_step()
+    state.set_time_of_day(15 * 60)
+    log.info("\n\n--- SIMULATING TIME: 3:00 PM (SUCCESSFUL MEDICATION TASK) ---")
+    await planner.run_step()
+    await planner.wait_for_background_actions()
 
-    print("\n=======================================================================")
-    print("                     SIMULATION END OF DAY SUMMARY                     ")
-    print("=======================================================================")
-    print("Final Daily Schedule Status:")
-    print(json.dumps(state.daily_schedule, indent=4))
-    print("\nFinal Escalation Log:")
-    print(state.escalation_log)
+    log.info("\n=======================================================================")
+    log.info("                     SIMULATION END OF DAY SUMMARY                     ")
+    log.info("=======================================================================")
+    log.info("Final Daily Schedule Status:")
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({SessionState.format_minute(k): v.to_dict() for k, v in state.daily_schedule.items()}, indent=4))
+    log.info("\nFinal Escalation Log:")
+    log.info("%s", list(state.iter_escalation_log()))
 
 
 if __name__ == "__main__":
-    run_eca_crew_simulation()
+    configure_logging()
+    try:
+        asyncio.run(run_eca_crew_simulation())
+    finally:
+        stop_logging()
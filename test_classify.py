@@ -0,0 +1,31 @@
+import unittest
+
+from classify import RESPONSE_CONFIRMED, RESPONSE_OTHER, RESPONSE_TIMEOUT, encode_response
+
+
+class EncodeResponseTest(unittest.TestCase):
+    def test_timeout_sentinel(self):
+        self.assertEqual(encode_response("TIMEOUT"), RESPONSE_TIMEOUT)
+
+    def test_confirmations(self):
+        for reply in ("I confirm I took it. Thanks.", "Took it", "CONFIRMED"):
+            with self.subTest(reply=reply):
+                self.assertEqual(encode_response(reply), RESPONSE_CONFIRMED)
+
+    def test_negated_replies_are_not_confirmations(self):
+        for reply in (
+            "No, I haven't taken it",
+            "I didn't take it",
+            "I have not took it yet",
+            "I can't confirm, I never took it",
+            "I didn’t confirm",
+        ):
+            with self.subTest(reply=reply):
+                self.assertEqual(encode_response(reply), RESPONSE_OTHER)
+
+    def test_unrelated_reply(self):
+        self.assertEqual(encode_response("What is this pill for?"), RESPONSE_OTHER)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+
+from main import (
+    A2AArtifact, ActivityCoordinatorAgent, CustomTools, FacilityPlanner, HealthManagerAgent, LLMSimulator,
+    PlannerAgent, SessionState, TaskStatus, decode_a2a, encode_a2a,
+)
+
+
+class RecordingNotifier:
+    """Notifier double that records a message only after yielding to the event loop."""
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send(self, message: str) -> bool:
+        await asyncio.sleep(0)
+        self.sent.append(message)
+        return True
+
+
+def make_planner(notifier, start_minute: int = 8 * 60) -> PlannerAgent:
+    state = SessionState(start_minute=start_minute)
+    llm = LLMSimulator()
+    return PlannerAgent(state, HealthManagerAgent(llm, state), ActivityCoordinatorAgent(llm, state), notifier)
+
+
+class RetrieveLongTermMemoryTest(unittest.TestCase):
+    def test_blood_pressure_query_matches_record(self):
+        result = CustomTools.retrieve_long_term_memory("Medication: Blood Pressure Med", namespace="Mr. David")
+        self.assertIn("Lisinopril", result)
+
+    def test_scattered_terms_do_not_match_record(self):
+        result = CustomTools.retrieve_long_term_memory("Low blood sugar; pressure sores", namespace="Mr. David")
+        self.assertNotIn("Lisinopril", result)
+
+
+class CountingLLM(LLMSimulator):
+    """LLMSimulator whose conversational answer changes on every call."""
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = 0
+
+    def activity_coordinator_response(self, query: str) -> str:
+        self.calls += 1
+        return f"answer #{self.calls}"
+
+
+class ActivityCoordinatorCacheTest(unittest.TestCase):
+    def test_repeat_query_reuses_answer_until_health_data_changes(self):
+        state = SessionState(start_minute=8 * 60)
+        llm = CountingLLM()
+        coordinator = ActivityCoordinatorAgent(llm, state)
+
+        first = asyncio.run(coordinator.handle_user_query("What should I eat for breakfast?"))
+        repeat = asyncio.run(coordinator.handle_user_query("  what should I eat for BREAKFAST? "))
+        state.user_profile["health_data"] = "Diabetic diet"
+        after_change = asyncio.run(coordinator.handle_user_query("What should I eat for breakfast?"))
+
+        self.assertEqual(first, repeat)
+        self.assertNotEqual(first, after_change)
+        self.assertEqual(llm.calls, 2)
+
+
+class A2ACodecTest(unittest.TestCase):
+    def test_round_trip(self):
+        message = {
+            "agent_source": "HealthManagerAgent",
+            "task_id": 0,
+            "a2a_artifact": A2AArtifact("pending_follow_up", "none", "Café? Let me check."),
+        }
+        self.assertEqual(decode_a2a(encode_a2a(message)), message)
+
+    def test_decode_rejects_unknown_status(self):
+        payload = b'{"agent_source":"HealthManagerAgent","task_id":0,' \
+                  b'"a2a_artifact":{"a2a_status":"lost","next_action":"none","response_text":""}}'
+        with self.assertRaises(ValueError):
+            decode_a2a(payload)
+
+
+class PlannerAgentTest(unittest.TestCase):
+    def test_reprocessing_escalated_artifact_sends_no_second_alert(self):
+        notifier = RecordingNotifier()
+        planner = make_planner(notifier)
+
+        async def escalate_twice():
+            payload = await planner.health_manager.issue_reminder_and_check_compliance(8 * 60, 0)
+            first = await planner.process_a2a_artifact(decode_a2a(payload))
+            second = await planner.process_a2a_artifact(decode_a2a(payload))
+            await planner.wait_for_background_actions()
+            return first, second
+
+        first, second = asyncio.run(escalate_twice())
+
+        self.assertEqual(first, TaskStatus.MISSED_ESCALATED)
+        self.assertEqual(second, TaskStatus.MISSED_ESCALATED)
+        self.assertEqual(len(notifier.sent), 1)
+        self.assertEqual(list(planner.state.iter_escalation_log()), ["08:00 - Medication: Blood Pressure Med missed."])
+
+
+class FacilityPlannerTest(unittest.TestCase):
+    def test_tick_completes_every_due_residents_alert(self):
+        notifiers = [RecordingNotifier(), RecordingNotifier()]
+        planners = [make_planner(notifier) for notifier in notifiers]
+        facility = FacilityPlanner(planners)
+
+        # A fresh event loop that closes as soon as the tick returns.
+        asyncio.run(facility.run_step(planners[0].state.now_min))
+
+        for notifier in notifiers:
+            self.assertEqual(notifier.sent, ["Mr. David missed their Medication: Blood Pressure Med."])
+        for planner in planners:
+            self.assertFalse(planner._background_actions)
+
+
+if __name__ == "__main__":
+    unittest.main()